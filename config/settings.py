@@ -6,53 +6,103 @@ Uses python-dotenv for local development and environment variables for productio
 """
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load .env file for local development
-load_dotenv()
+_DOTENV_LOADED = False
 
 
+def _load_dotenv_once() -> None:
+    """Load the .env file for local development, at most once per process."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+@dataclass(frozen=True, slots=True, repr=False)
 class Settings:
     """
     Application settings loaded from environment variables.
-    
-    Ensures no hardcoded credentials in code.
+
+    Ensures no hardcoded credentials in code. Instances are immutable and
+    safe to share across threads; use get_settings() to obtain the
+    process-wide instance.
     """
 
     # Database Configuration
-    DB_HOST: str = os.getenv("DB_HOST", "localhost")
-    DB_PORT: int = int(os.getenv("DB_PORT", "5432"))
-    DB_NAME: str = os.getenv("DB_NAME", "etl_db")
-    DB_USER: str = os.getenv("DB_USER")
-    DB_PASSWORD: str = os.getenv("DB_PASSWORD")
+    DB_HOST: str = "localhost"
+    DB_PORT: int = 5432
+    DB_NAME: str = "etl_db"
+    DB_USER: Optional[str] = None
+    DB_PASSWORD: Optional[str] = None
+    DB_POOL_MIN: int = 5
+    DB_POOL_MAX: int = 25
+    DB_POOL_RECYCLE: int = 3600
 
     # Google Sheets Configuration
-    GOOGLE_SHEET_ID: str = os.getenv("GOOGLE_SHEET_ID")
-    GOOGLE_CREDENTIALS_PATH: str = os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json")
+    GOOGLE_SHEET_ID: Optional[str] = None
+    GOOGLE_CREDENTIALS_PATH: str = "credentials.json"
 
     # ETL Configuration
-    SHEET_NAME: str = os.getenv("SHEET_NAME", "Students")
-    BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "100"))
-    MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
+    SHEET_NAME: str = "Students"
+    BATCH_SIZE: int = 1000
+    CHUNK_ROWS: int = 10000
+    MAX_RETRIES: int = 3
+    BULK_UNSAFE: bool = False
 
     # Logging Configuration
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "logs/etl.log")
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str = "logs/etl.log"
 
-    def __init__(self):
+    def __post_init__(self):
         """Validate required settings on initialization."""
         self._validate_settings()
 
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from environment variables (and .env, if present).
+
+        Returns:
+            Validated Settings instance
+
+        Raises:
+            ValueError: If required settings are missing
+        """
+        _load_dotenv_once()
+
+        return cls(
+            DB_HOST=os.getenv("DB_HOST", "localhost"),
+            DB_PORT=int(os.getenv("DB_PORT", "5432")),
+            DB_NAME=os.getenv("DB_NAME", "etl_db"),
+            DB_USER=os.getenv("DB_USER"),
+            DB_PASSWORD=os.getenv("DB_PASSWORD"),
+            DB_POOL_MIN=int(os.getenv("DB_POOL_MIN", "5")),
+            DB_POOL_MAX=int(os.getenv("DB_POOL_MAX", "25")),
+            DB_POOL_RECYCLE=int(os.getenv("DB_POOL_RECYCLE", "3600")),
+            GOOGLE_SHEET_ID=os.getenv("GOOGLE_SHEET_ID"),
+            GOOGLE_CREDENTIALS_PATH=os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json"),
+            SHEET_NAME=os.getenv("SHEET_NAME", "Students"),
+            BATCH_SIZE=int(os.getenv("BATCH_SIZE", "1000")),
+            CHUNK_ROWS=int(os.getenv("CHUNK_ROWS", "10000")),
+            MAX_RETRIES=int(os.getenv("MAX_RETRIES", "3")),
+            BULK_UNSAFE=os.getenv("BULK_UNSAFE", "false").lower() in ("1", "true", "yes"),
+            LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+            LOG_FILE=os.getenv("LOG_FILE", "logs/etl.log"),
+        )
+
     def _validate_settings(self) -> None:
         """
         Validate that all required settings are provided.
-        
+
         Raises:
             ValueError: If required settings are missing
         """
         required_fields = ["DB_USER", "DB_PASSWORD", "GOOGLE_SHEET_ID"]
-        
+
         missing_fields = [
             field for field in required_fields
             if not getattr(self, field, None)
@@ -74,3 +124,17 @@ class Settings:
             f"BATCH_SIZE={self.BATCH_SIZE}"
             f")"
         )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide settings, reading the environment only once.
+
+    Returns:
+        Cached Settings instance
+
+    Raises:
+        ValueError: If required settings are missing
+    """
+    return Settings.from_env()
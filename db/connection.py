@@ -5,6 +5,10 @@ Provides connection pooling and context management for database operations.
 Handles connection lifecycle and error handling.
 """
 
+import atexit
+import threading
+import time
+import weakref
 import psycopg2
 from psycopg2 import pool, OperationalError
 from contextlib import contextmanager
@@ -13,20 +17,22 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Guards pool creation and teardown across threads
+_INIT_LOCK = threading.Lock()
+
 
 class DatabaseConnection:
     """
     Manages PostgreSQL connections with connection pooling.
-    """
 
-    _instance = None
-    _pool: Optional[pool.SimpleConnectionPool] = None
+    All state is held at class level; use the class directly rather than
+    instantiating it.
+    """
 
-    def __new__(cls):
-        """Ensure singleton pattern for connection pool."""
-        if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
-        return cls._instance
+    _pool: Optional[pool.ThreadedConnectionPool] = None
+    _max_connections: int = 0
+    _recycle_seconds: float = 0
+    _created_at: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
 
     @classmethod
     def initialize(
@@ -38,10 +44,15 @@ class DatabaseConnection:
         password: str,
         min_connections: int = 1,
         max_connections: int = 10,
+        recycle_seconds: float = 3600,
     ) -> None:
         """
         Initialize the connection pool.
 
+        Uses a thread-safe pool so that loaders may run batches concurrently,
+        each on its own pooled connection. Calling this while a pool already
+        exists is a no-op.
+
         Args:
             host: PostgreSQL server host
             port: PostgreSQL server port
@@ -50,33 +61,75 @@ class DatabaseConnection:
             password: Database password
             min_connections: Minimum pool connections
             max_connections: Maximum pool connections
+            recycle_seconds: Discard pooled connections older than this
+                on checkout (0 disables recycling)
 
         Raises:
             OperationalError: If connection fails
         """
-        try:
-            cls._pool = pool.SimpleConnectionPool(
-                min_connections,
-                max_connections,
-                host=host,
-                port=port,
-                database=database,
-                user=user,
-                password=password,
-                connect_timeout=10,
-            )
-            logger.info(f"Database pool initialized with {min_connections}-{max_connections} connections")
-        except OperationalError as e:
-            logger.error(f"Failed to initialize database pool: {e}")
-            raise
+        with _INIT_LOCK:
+            if cls._pool is not None:
+                logger.debug("Database pool already initialized")
+                return
+
+            try:
+                cls._pool = pool.ThreadedConnectionPool(
+                    min_connections,
+                    max_connections,
+                    host=host,
+                    port=port,
+                    database=database,
+                    user=user,
+                    password=password,
+                    connect_timeout=10,
+                )
+                cls._max_connections = max_connections
+                cls._recycle_seconds = recycle_seconds
+                logger.info(
+                    "Database pool initialized with %d-%d connections", min_connections, max_connections
+                )
+            except OperationalError as e:
+                logger.error("Failed to initialize database pool: %s", e)
+                raise
 
     @classmethod
     def close_all(cls) -> None:
         """Close all connections in the pool."""
-        if cls._pool:
-            cls._pool.closeall()
-            cls._pool = None
-            logger.info("Database pool closed")
+        with _INIT_LOCK:
+            if cls._pool:
+                cls._pool.closeall()
+                cls._pool = None
+                cls._max_connections = 0
+                logger.info("Database pool closed")
+
+    @classmethod
+    def max_connections(cls) -> int:
+        """
+        Return the maximum size of the initialized pool.
+
+        Returns:
+            Maximum number of pooled connections (0 if not initialized)
+        """
+        return cls._max_connections
+
+    @classmethod
+    def _checkout(cls):
+        """
+        Take a connection from the pool, replacing any past its recycle age.
+
+        Returns:
+            psycopg2 connection object
+        """
+        while True:
+            conn = cls._pool.getconn()
+            now = time.monotonic()
+            created_at = cls._created_at.setdefault(conn, now)
+
+            if not cls._recycle_seconds or now - created_at <= cls._recycle_seconds:
+                return conn
+
+            logger.debug("Recycling pooled connection older than %ds", cls._recycle_seconds)
+            cls._pool.putconn(conn, close=True)
 
     @classmethod
     @contextmanager
@@ -95,14 +148,14 @@ class DatabaseConnection:
 
         conn = None
         try:
-            conn = cls._pool.getconn()
+            conn = cls._checkout()
             yield conn
             conn.commit()
             logger.debug("Transaction committed successfully")
         except Exception as e:
             if conn:
                 conn.rollback()
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             raise
         finally:
             if conn:
@@ -137,6 +190,29 @@ class DatabaseConnection:
             finally:
                 cursor.close()
 
+    @classmethod
+    @contextmanager
+    def bulk_session(cls, synchronous_commit: bool = True):
+        """
+        Context manager for a bulk-load transaction.
+
+        With synchronous_commit=False, the transaction starts with
+        SET LOCAL synchronous_commit = off, so COMMIT returns without
+        waiting for the WAL flush. A server crash can then lose the most
+        recently committed batches (the database stays consistent); only
+        use this for idempotent loads that can simply be re-run.
+
+        Args:
+            synchronous_commit: Whether commits wait for the WAL flush
+
+        Yields:
+            psycopg2 cursor object
+        """
+        with cls.get_cursor() as cursor:
+            if not synchronous_commit:
+                cursor.execute("SET LOCAL synchronous_commit = off;")
+            yield cursor
+
     @classmethod
     def execute_query(cls, query: str, params: Optional[tuple] = None) -> list:
         """
@@ -184,3 +260,7 @@ class DatabaseConnection:
         with cls.get_cursor(commit=True) as cursor:
             cursor.executemany(query, data)
             return cursor.rowcount
+
+
+# The pool lives for the whole process; close it on interpreter exit
+atexit.register(DatabaseConnection.close_all)
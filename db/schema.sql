@@ -58,6 +58,10 @@ CREATE INDEX IF NOT EXISTS idx_invalid_rows_run_id ON invalid_rows(etl_run_id);
 -- Create index on created_at for date range queries
 CREATE INDEX IF NOT EXISTS idx_etl_runs_timestamp ON etl_runs(run_timestamp);
 
+-- Time-window metrics filter etl_runs.run_timestamp (indexed above); nothing
+-- range-filters invalid_rows.created_at, so drop the earlier BRIN index
+DROP INDEX IF EXISTS idx_invalid_rows_created_at_brin;
+
 -- Enhanced ETL Runs table with additional metrics
 ALTER TABLE etl_runs ADD COLUMN IF NOT EXISTS duplicate_emails INTEGER DEFAULT 0;
 ALTER TABLE etl_runs ADD COLUMN IF NOT EXISTS skipped_rows INTEGER DEFAULT 0;
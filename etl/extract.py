@@ -6,19 +6,25 @@ Handles authentication via service account or OAuth.
 """
 
 import logging
-from typing import Optional, List
+from functools import cached_property
+from typing import Iterator, Optional, List
 import pandas as pd
 import gspread
+from gspread.utils import ValueRenderOption, rowcol_to_a1
 from google.oauth2.service_account import Credentials
 
 logger = logging.getLogger(__name__)
 
+# Columns re-read with FORMATTED_VALUE so they arrive exactly as displayed
+TEXT_COLUMNS = frozenset({"name", "email", "phone"})
+
 
 class GoogleSheetsExtractor:
     """
     Extracts data from Google Sheets.
     
     Supports both service account and OAuth authentication.
+    Authentication is deferred until the client is first used.
     """
 
     SCOPES = [
@@ -32,19 +38,21 @@ class GoogleSheetsExtractor:
 
         Args:
             credentials_path: Path to service account JSON file
-
-        Raises:
-            FileNotFoundError: If credentials file not found
-            Exception: If authentication fails
         """
         self.credentials_path = credentials_path
-        self.client: Optional[gspread.Client] = None
-        self._authenticate()
 
-    def _authenticate(self) -> None:
+    @cached_property
+    def client(self) -> gspread.Client:
+        """Authenticated gspread client, created on first access."""
+        return self._authenticate()
+
+    def _authenticate(self) -> gspread.Client:
         """
         Authenticate with Google Sheets API using service account.
 
+        Returns:
+            Authorized gspread client
+
         Raises:
             FileNotFoundError: If credentials file not found
             Exception: If authentication fails
@@ -53,8 +61,9 @@ class GoogleSheetsExtractor:
             credentials = Credentials.from_service_account_file(
                 self.credentials_path, scopes=self.SCOPES
             )
-            self.client = gspread.authorize(credentials)
+            client = gspread.authorize(credentials)
             logger.info("Successfully authenticated with Google Sheets API")
+            return client
         except FileNotFoundError:
             logger.error(f"Credentials file not found: {self.credentials_path}")
             raise
@@ -74,7 +83,7 @@ class GoogleSheetsExtractor:
         Args:
             sheet_id: Google Sheet ID
             sheet_name: Name of the sheet tab (default: "Sheet1")
-            skip_rows: Number of header rows to skip (default: 0)
+            skip_rows: Number of data rows to skip after the header row (default: 0)
 
         Returns:
             pandas DataFrame with extracted data
@@ -89,18 +98,19 @@ class GoogleSheetsExtractor:
             spreadsheet = self.client.open_by_key(sheet_id)
             worksheet = spreadsheet.worksheet(sheet_name)
 
-            # Get all values (including headers)
-            data = worksheet.get_all_values()
+            # Get all rows as lists. UNFORMATTED_VALUE returns native numbers;
+            # text columns are then overlaid with their formatted values.
+            data = worksheet.get_values(value_render_option=ValueRenderOption.unformatted)
 
             if not data:
                 logger.warning(f"No data found in sheet {sheet_name}")
                 return pd.DataFrame()
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data[skip_rows:], columns=data[0])
-
-            # Remove empty rows
-            df = df.dropna(how="all")
+            # First row as headers; build the frame in one pass from row lists
+            header, *rows = data
+            rows = rows[skip_rows:]
+            self._overlay_text_columns(worksheet, header, rows, first_row=2 + skip_rows)
+            df = pd.DataFrame.from_records(rows, columns=header)
 
             logger.info(f"Successfully extracted {len(df)} rows from {sheet_name}")
             logger.debug(f"Columns: {list(df.columns)}")
@@ -117,6 +127,115 @@ class GoogleSheetsExtractor:
             logger.error(f"Failed to extract data from Google Sheets: {e}")
             raise
 
+    def _overlay_text_columns(
+        self,
+        worksheet: gspread.Worksheet,
+        header: List,
+        rows: List[List],
+        first_row: int,
+    ) -> None:
+        """
+        Replace text columns in unformatted rows with their formatted values.
+
+        UNFORMATTED_VALUE turns a number cell displayed as "0987654321" into
+        the int 987654321. Name, email and phone are fetched again with
+        FORMATTED_VALUE in a single batch request and written over rows in
+        place.
+
+        Args:
+            worksheet: Worksheet the rows were read from
+            header: Header row of the sheet
+            rows: Data rows, padded to the header width
+            first_row: Sheet row number of rows[0]
+        """
+        targets = [
+            idx for idx, column in enumerate(header)
+            if str(column).strip().lower().replace(" ", "_") in TEXT_COLUMNS
+        ]
+        if not targets or not rows:
+            return
+
+        last_row = first_row + len(rows) - 1
+        ranges = []
+        for idx in targets:
+            letter = rowcol_to_a1(1, idx + 1)[:-1]
+            ranges.append(f"{letter}{first_row}:{letter}{last_row}")
+
+        columns = worksheet.batch_get(
+            ranges,
+            major_dimension="COLUMNS",
+            value_render_option=ValueRenderOption.formatted,
+        )
+        # Trailing empty cells are omitted; those stay as the unformatted ""
+        for idx, values in zip(targets, columns):
+            for row, value in zip(rows, values[0] if values else []):
+                row[idx] = value
+
+    def iter_extract(
+        self,
+        sheet_id: str,
+        sheet_name: str = "Sheet1",
+        chunk_rows: int = 10000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Extract a Google Sheet as a stream of DataFrames.
+
+        Reads the header row once, then fetches chunk_rows data rows per
+        request, so only one chunk of the sheet is held in memory at a time.
+
+        Args:
+            sheet_id: Google Sheet ID
+            sheet_name: Name of the sheet tab (default: "Sheet1")
+            chunk_rows: Data rows per chunk (default: 10000)
+
+        Yields:
+            DataFrames with the header row as columns
+
+        Raises:
+            Exception: If sheet access fails
+        """
+        try:
+            logger.info(f"Extracting data from sheet: {sheet_name} in chunks of {chunk_rows} rows")
+
+            spreadsheet = self.client.open_by_key(sheet_id)
+            worksheet = spreadsheet.worksheet(sheet_name)
+
+            header = worksheet.row_values(1, value_render_option=ValueRenderOption.unformatted)
+            if not header:
+                logger.warning(f"No data found in sheet {sheet_name}")
+                return
+
+            width = len(header)
+            extracted = 0
+
+            # Row 1 is the header; row_count is the grid size, which may
+            # include trailing empty rows (those come back empty)
+            for start in range(2, worksheet.row_count + 1, chunk_rows):
+                end = start + chunk_rows - 1
+                rows = worksheet.get_values(
+                    f"{start}:{end}", value_render_option=ValueRenderOption.unformatted
+                )
+                if not rows:
+                    continue
+
+                # The API omits trailing empty cells; pad rows to the header
+                rows = [row[:width] + [""] * (width - len(row)) for row in rows]
+                self._overlay_text_columns(worksheet, header, rows, first_row=start)
+                extracted += len(rows)
+                yield pd.DataFrame.from_records(rows, columns=header)
+
+            logger.info(f"Successfully extracted {extracted} rows from {sheet_name}")
+
+        except gspread.exceptions.SpreadsheetNotFound:
+            logger.error(f"Spreadsheet not found: {sheet_id}")
+            raise
+        except gspread.exceptions.WorksheetNotFound:
+            logger.error(f"Worksheet '{sheet_name}' not found in spreadsheet")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to extract data from Google Sheets: {e}")
+            raise
+
     def extract_range(
         self,
         sheet_id: str,
@@ -151,8 +270,8 @@ class GoogleSheetsExtractor:
                 return pd.DataFrame()
 
             # First row as headers
-            df = pd.DataFrame(data[1:], columns=data[0])
-            df = df.dropna(how="all")
+            header, *rows = data
+            df = pd.DataFrame.from_records(rows, columns=header)
 
             logger.info(f"Successfully extracted {len(df)} rows from range {cell_range}")
 
@@ -171,11 +290,33 @@ def fetch_google_sheet(settings) -> pd.DataFrame:
         settings: Settings object with GOOGLE_CREDENTIALS_PATH and GOOGLE_SHEET_ID
 
     Returns:
-        pandas DataFrame with extracted data
+        pandas DataFrame with extracted data, using Arrow-backed dtypes
     """
     extractor = GoogleSheetsExtractor(settings.GOOGLE_CREDENTIALS_PATH)
     df = extractor.extract(
         sheet_id=settings.GOOGLE_SHEET_ID,
         sheet_name=settings.SHEET_NAME,
     )
-    return df
+    # Arrow-backed columns keep string ops in Arrow kernels downstream;
+    # mixed-type columns (e.g. a year column with typos) stay object
+    return df.convert_dtypes(dtype_backend="pyarrow")
+
+
+def iter_google_sheet(settings) -> Iterator[pd.DataFrame]:
+    """
+    Convenience function to stream the sheet in chunks using settings.
+
+    Args:
+        settings: Settings object with GOOGLE_CREDENTIALS_PATH, GOOGLE_SHEET_ID
+            and CHUNK_ROWS
+
+    Yields:
+        pandas DataFrames of up to CHUNK_ROWS rows, using Arrow-backed dtypes
+    """
+    extractor = GoogleSheetsExtractor(settings.GOOGLE_CREDENTIALS_PATH)
+    for df in extractor.iter_extract(
+        sheet_id=settings.GOOGLE_SHEET_ID,
+        sheet_name=settings.SHEET_NAME,
+        chunk_rows=settings.CHUNK_ROWS,
+    ):
+        yield df.convert_dtypes(dtype_backend="pyarrow")
@@ -5,15 +5,155 @@ Handles idempotent inserts, upserts, and dead-letter queue management.
 Ensures data consistency and tracks load metrics.
 """
 
+import io
 import logging
-import json
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Mapping, Optional, Set, Union
 from datetime import datetime
 
+import pandas as pd
+from psycopg2.extras import execute_values
+
 from db.connection import DatabaseConnection
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None  # type: ignore[assignment]
+    import json
+
 logger = logging.getLogger(__name__)
 
+# Column order of rows sent to the students table
+STUDENT_COLUMNS = ["email", "name", "department_id", "year", "phone"]
+
+# Maximum department names per upsert statement; keeps statement size and
+# planning cost bounded when a sheet references very many departments
+DEPARTMENT_CHUNK_SIZE = 1000
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Yield successive lists of up to size items without slicing copies.
+
+    Args:
+        items: Any iterable (consumed lazily)
+        size: Maximum items per chunk
+
+    Yields:
+        Lists of at most size items
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _dumps(value: Any) -> str:
+    """
+    Serialize a raw record to JSON text for the dead-letter queue.
+
+    Args:
+        value: Raw record (typically a dict)
+
+    Returns:
+        JSON string; values that cannot be encoded natively fall back to str()
+    """
+    if orjson is None:
+        return json.dumps(value, default=str)
+    return orjson.dumps(value, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def _copy_field(value: Any) -> str:
+    """
+    Render a value as a field in PostgreSQL COPY text format.
+
+    Args:
+        value: Python value to render
+
+    Returns:
+        Escaped field text ("\\N" for None)
+    """
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_buffer(rows: List[Tuple]) -> io.StringIO:
+    """
+    Serialize rows into a tab-separated buffer for COPY FROM STDIN.
+
+    Args:
+        rows: List of row tuples
+
+    Returns:
+        StringIO positioned at the start of the data
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_field(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+class _CopyStream(io.TextIOBase):
+    """
+    Read-only text stream that renders rows for COPY FROM STDIN on demand.
+
+    copy_expert() pulls fixed-size blocks through read(), so rows are
+    serialized only as the server consumes them and the full COPY payload
+    never exists in memory.
+    """
+
+    def __init__(self, rows: Iterable[Tuple]):
+        """
+        Initialize stream.
+
+        Args:
+            rows: Iterable of row tuples (consumed lazily)
+        """
+        self._lines = ("\t".join(_copy_field(value) for value in row) + "\n" for row in rows)
+        self._pending = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        """
+        Return up to size characters of COPY text ("" at end of data).
+
+        Args:
+            size: Maximum characters to return; None or negative reads
+                everything
+
+        Returns:
+            COPY text-format data
+        """
+        if size is None:
+            size = -1
+
+        parts = [self._pending]
+        length = len(self._pending)
+        for line in self._lines:
+            parts.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+
+        data = "".join(parts)
+        if 0 <= size < len(data):
+            data, self._pending = data[:size], data[size:]
+        else:
+            self._pending = ""
+        return data
+
 
 class StudentLoader:
     """
@@ -23,10 +163,25 @@ class StudentLoader:
     Automatically creates departments as needed.
     """
 
+    # Department name -> ID, shared by all loaders for the process lifetime.
+    # Departments are never renamed or deleted by the pipeline, so entries
+    # stay valid; only names not seen before hit the database.
+    _dept_cache: Dict[str, int] = {}
+
+    def __init__(self, bulk_unsafe: bool = False):
+        """
+        Initialize student loader.
+
+        Args:
+            bulk_unsafe: Commit batches without waiting for the WAL flush
+                (see DatabaseConnection.bulk_session)
+        """
+        self.bulk_unsafe = bulk_unsafe
+
     def load_students(
         self,
-        records: List[Dict[str, Any]],
-        batch_size: int = 100,
+        records: Union[List[Dict[str, Any]], pd.DataFrame],
+        batch_size: int = 1000,
     ) -> Dict[str, int]:
         """
         Load valid student records into database.
@@ -36,149 +191,233 @@ class StudentLoader:
         - Suitable for repeated ETL runs with same data
 
         Args:
-            records: List of valid student records
-            batch_size: Number of records per batch insert
+            records: Valid student records, as a list of dicts or a DataFrame
+            batch_size: Number of records per batch insert. Loads smaller
+                than four batches are sent as one batch, since per-batch
+                round trips dominate at that size.
 
         Returns:
             Dictionary with metrics: {inserted: int, skipped: int, duplicates: int}
         """
-        if not records:
+        if len(records) == 0:
             logger.info("No records to load")
             return {"inserted": 0, "skipped": 0, "duplicates": 0}
 
-        logger.info(f"Loading {len(records)} student records")
+        logger.info("Loading %d student records", len(records))
 
         metrics = {"inserted": 0, "skipped": 0, "duplicates": 0}
 
+        if len(records) < batch_size * 4:
+            batch_size = len(records)
+
         try:
-            # Ensure departments exist
-            self._ensure_departments(records)
+            if isinstance(records, pd.DataFrame):
+                records = records.reindex(columns=["email", "name", "department", "year", "phone"])
+                department_names = records["department"].dropna().unique()
+            else:
+                department_names = {record.get("department") for record in records}
+
+            # Resolve department IDs once for the whole load
+            department_ids = self._resolve_departments(department_names)
+
+            batches = chunked(self._build_rows(records, department_ids), batch_size)
+            batch_count = -(-len(records) // batch_size)
 
-            # Load students in batches
-            for i in range(0, len(records), batch_size):
-                batch = records[i : i + batch_size]
-                batch_metrics = self._load_batch(batch)
+            # Load batches concurrently, one pooled connection per worker,
+            # leaving one connection free for the rest of the pipeline.
+            # ON CONFLICT keeps concurrent inserts idempotent per row.
+            max_workers = min(batch_count, DatabaseConnection.max_connections() - 1)
+
+            for batch_metrics in self._run_batches(batches, max_workers):
                 metrics["inserted"] += batch_metrics["inserted"]
                 metrics["skipped"] += batch_metrics["skipped"]
 
             logger.info(
-                f"Successfully loaded students: "
-                f"{metrics['inserted']} inserted, {metrics['skipped']} skipped"
+                "Successfully loaded students: %d inserted, %d skipped",
+                metrics["inserted"],
+                metrics["skipped"],
             )
 
             return metrics
 
         except Exception as e:
-            logger.error(f"Failed to load students: {e}")
+            logger.error("Failed to load students: %s", e)
             raise
 
-    def _ensure_departments(self, records: List[Dict[str, Any]]) -> None:
+    def _resolve_departments(self, names: Iterable[str]) -> Dict[str, int]:
         """
-        Create departments if they don't exist.
+        Create missing departments and return their IDs.
+
+        Uses a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING so that
+        both new and existing departments come back in one round trip. The
+        DO UPDATE is a no-op that makes conflicting rows visible to RETURNING.
+        Resolved IDs are memoized for the process lifetime, so names already
+        seen cost no DB calls, even across loader instances.
+        Large name sets are sent in chunks of DEPARTMENT_CHUNK_SIZE.
 
         Args:
-            records: List of student records
+            names: Department names referenced by the records
+
+        Returns:
+            Dictionary mapping department name to ID
         """
-        departments = set()
-        for record in records:
-            if record.get("department"):
-                departments.add(record["department"])
+        missing = {name for name in names if name and name not in self._dept_cache}
 
-        if not departments:
-            logger.debug("No departments to create")
-            return
+        if not missing:
+            return self._dept_cache
 
-        logger.info(f"Ensuring {len(departments)} departments exist")
+        logger.info("Resolving %d departments", len(missing))
 
-        # Insert departments, ignore if already exist
         query = """
             INSERT INTO departments (name)
-            VALUES (%s)
-            ON CONFLICT (name) DO NOTHING;
+            VALUES %s
+            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+            RETURNING id, name;
         """
 
-        department_list = [(dept,) for dept in departments]
-
         try:
-            DatabaseConnection.execute_many(query, department_list)
-            logger.debug(f"Departments ensured: {', '.join(departments)}")
+            with DatabaseConnection.get_cursor() as cursor:
+                results = execute_values(
+                    cursor,
+                    query,
+                    [(name,) for name in missing],
+                    page_size=DEPARTMENT_CHUNK_SIZE,
+                    fetch=True,
+                )
+            self._dept_cache.update({name: dept_id for dept_id, name in results})
+            logger.debug("Departments resolved: %s", ", ".join(missing))
+            return self._dept_cache
         except Exception as e:
-            logger.error(f"Failed to ensure departments: {e}")
+            logger.error("Failed to resolve departments: %s", e)
             raise
 
-    def _load_batch(self, records: List[Dict[str, Any]]) -> Dict[str, int]:
+    def _build_rows(
+        self,
+        records: Union[List[Dict[str, Any]], pd.DataFrame],
+        department_ids: Mapping[Any, int],
+    ) -> Iterator[Tuple]:
         """
-        Load a batch of student records.
+        Build INSERT parameter tuples ordered as STUDENT_COLUMNS.
+
+        DataFrames are converted column-wise and iterated with itertuples;
+        lists of dicts go through a single generator expression, which is
+        cheaper than constructing a DataFrame just to iterate it.
 
         Args:
-            records: Batch of student records
+            records: Records as a list of dicts, or a DataFrame with email,
+                name, department, year, phone columns
+            department_ids: Mapping of department name to ID
 
         Returns:
-            Dictionary with metrics: {inserted: int, skipped: int}
+            Iterator of tuples, with None for missing values
         """
-        # Get department IDs
-        department_ids = self._get_department_ids(records)
-
-        # Prepare INSERT statement with ON CONFLICT
-        query = """
-            INSERT INTO students (email, name, department_id, year, phone)
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (email) DO NOTHING
-            RETURNING id;
-        """
-
-        data = []
-        for record in records:
-            dept_id = department_ids.get(record.get("department"))
-            data.append(
+        if not isinstance(records, pd.DataFrame):
+            department_id = department_ids.get
+            return (
                 (
                     record.get("email"),
                     record.get("name"),
-                    dept_id,
+                    department_id(record.get("department")),
                     record.get("year"),
                     record.get("phone"),
                 )
+                for record in records
             )
 
-        try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.executemany(query, data)
-                inserted = cursor.rowcount
+        columns = pd.DataFrame(
+            {
+                "email": records["email"],
+                "name": records["name"],
+                "department_id": records["department"].map(department_ids).astype("Int64"),
+                "year": records["year"].astype("Int64"),
+                "phone": records["phone"],
+            },
+            columns=STUDENT_COLUMNS,
+        ).astype(object)
+        columns = columns.where(columns.notna(), None)
+        return columns.itertuples(index=False, name=None)
+
+    def _run_batches(
+        self,
+        batches: Iterable[List[Tuple]],
+        max_workers: int,
+    ) -> Iterator[Dict[str, int]]:
+        """
+        Load batches serially or on a thread pool, yielding batch metrics.
 
-            skipped = len(records) - inserted
-            logger.debug(f"Batch loaded: {inserted} inserted, {skipped} skipped")
+        At most two batches per worker are held in flight, so memory stays
+        bounded by a few batches rather than the whole load.
 
-            return {"inserted": inserted, "skipped": skipped}
+        Args:
+            batches: Iterable of row batches
+            max_workers: Maximum concurrent batch loads
 
-        except Exception as e:
-            logger.error(f"Failed to load batch: {e}")
-            raise
+        Yields:
+            Metrics dict per loaded batch
+        """
+        if max_workers <= 1:
+            for batch in batches:
+                yield self._load_batch(batch)
+            return
 
-    def _get_department_ids(self, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: Set[Future] = set()
+            for batch in batches:
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(self._load_batch, batch))
+
+            for future in pending:
+                yield future.result()
+
+    def _load_batch(self, rows: List[Tuple]) -> Dict[str, int]:
         """
-        Get department IDs for all departments in records.
+        Load a batch of student rows.
 
         Args:
-            records: List of student records
+            rows: Batch of parameter tuples ordered as STUDENT_COLUMNS
 
         Returns:
-            Dictionary mapping department name to ID
+            Dictionary with metrics: {inserted: int, skipped: int}
+        """
+        # COPY cannot express ON CONFLICT, so stage the batch in a temp table
+        # and merge it into students with a single INSERT ... SELECT.
+        staging_query = """
+            CREATE TEMP TABLE tmp_students ON COMMIT DROP AS
+            SELECT email, name, department_id, year, phone
+            FROM students
+            WITH NO DATA;
+        """
+
+        copy_query = """
+            COPY tmp_students (email, name, department_id, year, phone)
+            FROM STDIN
+        """
+
+        merge_query = """
+            INSERT INTO students (email, name, department_id, year, phone)
+            SELECT email, name, department_id, year, phone
+            FROM tmp_students
+            ON CONFLICT (email) DO NOTHING
         """
-        department_names = set()
-        for record in records:
-            if record.get("department"):
-                department_names.add(record["department"])
 
-        if not department_names:
-            return {}
+        try:
+            with DatabaseConnection.bulk_session(synchronous_commit=not self.bulk_unsafe) as cursor:
+                cursor.execute(staging_query)
+                cursor.copy_expert(copy_query, _copy_buffer(rows))
+                cursor.execute(merge_query)
+                inserted = cursor.rowcount
 
-        query = "SELECT id, name FROM departments WHERE name = ANY(%s);"
-        
-        with DatabaseConnection.get_cursor(commit=False) as cursor:
-            cursor.execute(query, (list(department_names),))
-            results = cursor.fetchall()
+            skipped = len(rows) - inserted
+            logger.debug("Batch loaded: %d inserted, %d skipped", inserted, skipped)
 
-        return {name: dept_id for dept_id, name in results}
+            return {"inserted": inserted, "skipped": skipped}
+
+        except Exception as e:
+            logger.error("Failed to load batch: %s", e)
+            raise
 
 
 class InvalidRowLoader:
@@ -187,6 +426,16 @@ class InvalidRowLoader:
     Preserves raw data as JSON for inspection and reprocessing.
     """
 
+    def __init__(self, bulk_unsafe: bool = False):
+        """
+        Initialize invalid row loader.
+
+        Args:
+            bulk_unsafe: Commit without waiting for the WAL flush
+                (see DatabaseConnection.bulk_session)
+        """
+        self.bulk_unsafe = bulk_unsafe
+
     def load_invalid_rows(
         self,
         invalid_records: List[Dict[str, Any]],
@@ -195,6 +444,9 @@ class InvalidRowLoader:
         """
         Load invalid records into dead-letter queue.
 
+        Records are streamed into a single COPY and serialized only as the
+        server reads them.
+
         Args:
             invalid_records: List of invalid records with error reasons
             etl_run_id: Reference to ETL run
@@ -206,54 +458,60 @@ class InvalidRowLoader:
             logger.info("No invalid records to load")
             return 0
 
-        logger.info(f"Loading {len(invalid_records)} invalid records to dead-letter queue")
+        logger.info("Loading %d invalid records to dead-letter queue", len(invalid_records))
 
         query = """
-            INSERT INTO invalid_rows (etl_run_id, raw_data, error_reason, row_number)
-            VALUES (%s, %s, %s, %s);
+            COPY invalid_rows (etl_run_id, raw_data, error_reason, row_number)
+            FROM STDIN
         """
 
-        data = [
+        rows = (
             (
                 etl_run_id,
-                json.dumps(record.get("record", {})),
+                _dumps(record.get("record", {})),
                 record.get("error_reason", "Unknown error"),
                 record.get("row_number"),
             )
             for record in invalid_records
-        ]
+        )
 
         try:
-            inserted = DatabaseConnection.execute_many(query, data)
-            logger.info(f"Loaded {inserted} invalid records to dead-letter queue")
+            with DatabaseConnection.bulk_session(synchronous_commit=not self.bulk_unsafe) as cursor:
+                cursor.copy_expert(query, _CopyStream(rows))
+            inserted = len(invalid_records)
+
+            logger.info("Loaded %d invalid records to dead-letter queue", inserted)
             return inserted
 
         except Exception as e:
-            logger.error(f"Failed to load invalid records: {e}")
+            logger.error("Failed to load invalid records: %s", e)
             raise
 
 
 def load_students(
-    records: List[Dict[str, Any]],
-    batch_size: int = 100,
+    records: Union[List[Dict[str, Any]], pd.DataFrame],
+    batch_size: int = 1000,
+    bulk_unsafe: bool = False,
 ) -> Dict[str, int]:
     """
     Convenience function to load students.
 
     Args:
-        records: List of valid student records
+        records: Valid student records, as a list of dicts or a DataFrame
         batch_size: Batch size for inserts
+        bulk_unsafe: Commit batches without waiting for the WAL flush
 
     Returns:
         Dictionary with load metrics
     """
-    loader = StudentLoader()
+    loader = StudentLoader(bulk_unsafe=bulk_unsafe)
     return loader.load_students(records, batch_size)
 
 
 def load_invalid_rows(
     invalid_records: List[Dict[str, Any]],
     etl_run_id: int,
+    bulk_unsafe: bool = False,
 ) -> int:
     """
     Convenience function to load invalid records.
@@ -261,9 +519,10 @@ def load_invalid_rows(
     Args:
         invalid_records: List of invalid records with errors
         etl_run_id: Reference to ETL run
+        bulk_unsafe: Commit without waiting for the WAL flush
 
     Returns:
         Number of invalid rows inserted
     """
-    loader = InvalidRowLoader()
+    loader = InvalidRowLoader(bulk_unsafe=bulk_unsafe)
     return loader.load_invalid_rows(invalid_records, etl_run_id)
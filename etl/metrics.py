@@ -5,19 +5,103 @@ Provides programmatic access to ETL quality metrics and trends.
 Supports dashboards, alerts, and analytical queries.
 """
 
+import copy
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from functools import wraps
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
 
 from db.connection import DatabaseConnection
 
 logger = logging.getLogger(__name__)
 
+# (function name, args, kwargs, run state) -> (stored at, result)
+_cache: Dict[tuple, Tuple[float, Any]] = {}
+_cache_lock = threading.Lock()
 
-@dataclass
+
+def _run_state() -> Tuple[Optional[int], int]:
+    """
+    Return a fingerprint of etl_runs that changes whenever a run finishes.
+
+    Run rows are inserted as 'in_progress' and updated at finalize, so the
+    plain MAX(id) would not change when a run completes.
+
+    Returns:
+        Tuple of (newest finished run id, number of in-progress runs)
+    """
+    query = """
+        SELECT
+            MAX(id) FILTER (WHERE status <> 'in_progress'),
+            COUNT(*) FILTER (WHERE status = 'in_progress')
+        FROM etl_runs;
+    """
+    row = DatabaseConnection.execute_query(query)[0]
+    return row[0], row[1]
+
+
+def _cached(ttl_seconds: float = 300) -> Callable:
+    """
+    Cache a metrics query result until an ETL run starts or finishes.
+
+    The cache key includes the etl_runs state (see _run_state), so any
+    process sees a finished run on its next call; entries also expire
+    after ttl_seconds. Empty results are not cached, since the providers
+    return them on query failure. Callers get their own copy of the
+    result, so mutating it cannot corrupt later cache hits.
+
+    Args:
+        ttl_seconds: Maximum age of a cached result
+
+    Returns:
+        Decorator for metrics query functions
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                run_state = _run_state()
+            except Exception as e:
+                logger.warning(f"Metrics cache bypassed: {e}")
+                return func(*args, **kwargs)
+
+            key = (func.__name__, args, tuple(sorted(kwargs.items())), run_state)
+            now = time.monotonic()
+
+            with _cache_lock:
+                entry = _cache.get(key)
+            if entry is not None and now - entry[0] < ttl_seconds:
+                return copy.deepcopy(entry[1])
+
+            result = func(*args, **kwargs)
+            if result:
+                with _cache_lock:
+                    _cache[key] = (now, copy.deepcopy(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def clear_metrics_cache() -> None:
+    """Drop all cached metrics results (called when an ETL run finishes)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+@dataclass(frozen=True, slots=True)
 class QualityMetrics:
-    """Data quality metrics for a single ETL run."""
+    """
+    Data quality metrics for a single ETL run.
+
+    Rates are computed once at construction and stored as fields.
+    """
     run_id: int
     run_timestamp: datetime
     total_rows: int
@@ -28,42 +112,28 @@ class QualityMetrics:
     skipped_rows: int
     duration_seconds: float
     status: str
+    validity_rate: float = field(init=False)
+    error_rate: float = field(init=False)
+    duplicate_rate: float = field(init=False)
+    skip_rate: float = field(init=False)
+    throughput: float = field(init=False)
     
-    @property
-    def validity_rate(self) -> float:
-        """Calculate validity rate as percentage."""
-        if self.total_rows == 0:
-            return 0.0
-        return (self.valid_rows / self.total_rows) * 100
-    
-    @property
-    def error_rate(self) -> float:
-        """Calculate error rate as percentage."""
-        if self.total_rows == 0:
-            return 0.0
-        return (self.invalid_rows / self.total_rows) * 100
-    
-    @property
-    def duplicate_rate(self) -> float:
-        """Calculate duplicate rate as percentage."""
-        if self.total_rows == 0:
-            return 0.0
-        return (self.duplicate_emails / self.total_rows) * 100
-    
-    @property
-    def skip_rate(self) -> float:
-        """Calculate skip rate as percentage of processed rows."""
+    def __post_init__(self):
+        """Compute rates (percentages, and rows per second for throughput)."""
+        total = self.total_rows
         total_processed = self.inserted_rows + self.skipped_rows
-        if total_processed == 0:
-            return 0.0
-        return (self.skipped_rows / total_processed) * 100
-    
-    @property
-    def throughput(self) -> float:
-        """Calculate rows per second."""
-        if self.duration_seconds == 0:
-            return 0.0
-        return self.total_rows / self.duration_seconds
+        
+        rates = {
+            "validity_rate": (self.valid_rows / total) * 100 if total else 0.0,
+            "error_rate": (self.invalid_rows / total) * 100 if total else 0.0,
+            "duplicate_rate": (self.duplicate_emails / total) * 100 if total else 0.0,
+            "skip_rate": (
+                (self.skipped_rows / total_processed) * 100 if total_processed else 0.0
+            ),
+            "throughput": total / self.duration_seconds if self.duration_seconds else 0.0,
+        }
+        for name, value in rates.items():
+            object.__setattr__(self, name, value)
 
 
 @dataclass
@@ -80,6 +150,7 @@ class DailyMetrics:
     avg_duration: float
     successful_runs: int
     failed_runs: int
+    days_ago: int = 0  # Days before the database's CURRENT_DATE
     
     @property
     def daily_validity_rate(self) -> float:
@@ -112,7 +183,8 @@ class QualityMetricsProvider:
                 id, run_timestamp, total_rows, valid_rows, invalid_rows,
                 duplicate_emails, inserted_rows, skipped_rows, duration_seconds, status
             FROM etl_runs
-            ORDER BY run_timestamp DESC
+            WHERE status <> 'in_progress'
+            ORDER BY id DESC
             LIMIT 1;
         """
         
@@ -139,9 +211,13 @@ class QualityMetricsProvider:
             return None
     
     @staticmethod
+    @_cached(ttl_seconds=300)
     def get_daily_metrics(days: int = 30) -> List[DailyMetrics]:
         """
         Get daily aggregated metrics.
+
+        The window starts at midnight, so every returned day is complete
+        except today.
         
         Args:
             days: Number of days to fetch (default: 30)
@@ -151,7 +227,7 @@ class QualityMetricsProvider:
         """
         query = """
             SELECT 
-                DATE(run_timestamp) AS run_date,
+                date_trunc('day', run_timestamp)::date AS run_date,
                 COUNT(*) AS daily_runs,
                 SUM(total_rows) AS total_rows_processed,
                 SUM(valid_rows) AS total_valid_rows,
@@ -160,18 +236,18 @@ class QualityMetricsProvider:
                 SUM(inserted_rows) AS total_inserted,
                 SUM(skipped_rows) AS total_skipped,
                 ROUND(AVG(duration_seconds), 2) AS avg_duration_sec,
-                SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) AS successful_runs,
-                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) AS failed_runs
+                COUNT(*) FILTER (WHERE status = 'success') AS successful_runs,
+                COUNT(*) FILTER (WHERE status = 'failed') AS failed_runs,
+                CURRENT_DATE - date_trunc('day', run_timestamp)::date AS days_ago
             FROM etl_runs
-            WHERE run_timestamp > NOW() - INTERVAL %s
-            GROUP BY DATE(run_timestamp)
+            WHERE run_timestamp >= CURRENT_DATE - make_interval(days => %s)
+            GROUP BY date_trunc('day', run_timestamp)
             ORDER BY run_date DESC;
         """
         
         try:
-            results = DatabaseConnection.execute_query(
-                query, (f"{days} days",)
-            )
+            # The bare-column lower bound is a range scan on idx_etl_runs_timestamp
+            results = DatabaseConnection.execute_query(query, (days,))
             
             return [
                 DailyMetrics(
@@ -186,6 +262,7 @@ class QualityMetricsProvider:
                     avg_duration=row[8],
                     successful_runs=row[9],
                     failed_runs=row[10],
+                    days_ago=row[11],
                 )
                 for row in results
             ]
@@ -194,6 +271,7 @@ class QualityMetricsProvider:
             return []
     
     @staticmethod
+    @_cached(ttl_seconds=300)
     def get_error_breakdown(limit: int = 15) -> List[Dict[str, Any]]:
         """
         Get top errors by frequency.
@@ -204,15 +282,17 @@ class QualityMetricsProvider:
         Returns:
             List of error breakdown dictionaries
         """
+        # The total is computed once in the CTE
         query = """
+            WITH totals AS (SELECT COUNT(*) AS total FROM invalid_rows)
             SELECT 
                 error_reason,
                 COUNT(*) AS frequency,
                 COUNT(DISTINCT etl_run_id) AS affected_runs,
-                ROUND(100.0 * COUNT(*) / (SELECT COUNT(*) FROM invalid_rows), 2) AS pct_of_total,
+                ROUND(100.0 * COUNT(*) / totals.total, 2) AS pct_of_total,
                 MAX(created_at) AS last_occurrence
-            FROM invalid_rows
-            GROUP BY error_reason
+            FROM invalid_rows, totals
+            GROUP BY error_reason, totals.total
             ORDER BY frequency DESC
             LIMIT %s;
         """
@@ -235,6 +315,7 @@ class QualityMetricsProvider:
             return []
     
     @staticmethod
+    @_cached(ttl_seconds=300)
     def get_health_status() -> Dict[str, Any]:
         """
         Get overall ETL health status.
@@ -242,15 +323,17 @@ class QualityMetricsProvider:
         Returns:
             Dictionary with health metrics
         """
+        # One pass over etl_runs for all run aggregates
         query = """
             SELECT 
-                (SELECT COUNT(*) FROM etl_runs) AS total_runs,
-                (SELECT COUNT(*) FROM etl_runs WHERE status = 'success') AS successful_runs,
-                (SELECT SUM(total_rows) FROM etl_runs) AS all_rows_processed,
-                (SELECT SUM(valid_rows) FROM etl_runs) AS all_valid_rows,
-                (SELECT SUM(invalid_rows) FROM etl_runs) AS all_invalid_rows,
+                COUNT(*) AS total_runs,
+                COUNT(*) FILTER (WHERE status = 'success') AS successful_runs,
+                SUM(total_rows) AS all_rows_processed,
+                SUM(valid_rows) AS all_valid_rows,
+                SUM(invalid_rows) AS all_invalid_rows,
                 (SELECT COUNT(*) FROM students) AS current_students,
-                (SELECT MAX(run_timestamp) FROM etl_runs) AS last_run_time;
+                MAX(run_timestamp) AS last_run_time
+            FROM etl_runs;
         """
         
         try:
@@ -275,6 +358,7 @@ class QualityMetricsProvider:
             return {}
     
     @staticmethod
+    @_cached(ttl_seconds=300)
     def get_quality_scorecard() -> List[Dict[str, Any]]:
         """
         Get quality scorecard comparing current vs historical.
@@ -284,8 +368,12 @@ class QualityMetricsProvider:
         """
         try:
             latest = QualityMetricsProvider.get_latest_run()
-            daily_7d = QualityMetricsProvider.get_daily_metrics(days=7)
             daily_30d = QualityMetricsProvider.get_daily_metrics(days=30)
+
+            # The 7-day window is a subset of the 30-day one; slice it on
+            # days_ago, which the database computes against its own
+            # CURRENT_DATE (same timezone as the day buckets)
+            daily_7d = [d for d in daily_30d if d.days_ago <= 7]
             
             scorecard = []
             
@@ -302,51 +390,54 @@ class QualityMetricsProvider:
                     "status": latest.status,
                 })
             
-            # 7-day average
+            # 7-day and 30-day averages
             if daily_7d:
-                total_rows_7d = sum(d.total_rows for d in daily_7d)
-                valid_rows_7d = sum(d.valid_rows for d in daily_7d)
-                invalid_rows_7d = sum(d.invalid_rows for d in daily_7d)
-                duplicates_7d = sum(d.duplicates for d in daily_7d)
-                
-                validity_7d = (valid_rows_7d / total_rows_7d * 100) if total_rows_7d > 0 else 0
-                
-                scorecard.append({
-                    "period": "Last 7 Days Average",
-                    "run_time": None,
-                    "total_rows": round(total_rows_7d / len(daily_7d), 0),
-                    "valid_rows": round(valid_rows_7d / len(daily_7d), 0),
-                    "invalid_rows": round(invalid_rows_7d / len(daily_7d), 0),
-                    "duplicates": round(duplicates_7d / len(daily_7d), 0),
-                    "validity_pct": round(validity_7d, 2),
-                    "status": "N/A",
-                })
-            
-            # 30-day average
+                scorecard.append(
+                    QualityMetricsProvider._period_average("Last 7 Days Average", daily_7d)
+                )
             if daily_30d:
-                total_rows_30d = sum(d.total_rows for d in daily_30d)
-                valid_rows_30d = sum(d.valid_rows for d in daily_30d)
-                invalid_rows_30d = sum(d.invalid_rows for d in daily_30d)
-                duplicates_30d = sum(d.duplicates for d in daily_30d)
-                
-                validity_30d = (valid_rows_30d / total_rows_30d * 100) if total_rows_30d > 0 else 0
-                
-                scorecard.append({
-                    "period": "Last 30 Days Average",
-                    "run_time": None,
-                    "total_rows": round(total_rows_30d / len(daily_30d), 0),
-                    "valid_rows": round(valid_rows_30d / len(daily_30d), 0),
-                    "invalid_rows": round(invalid_rows_30d / len(daily_30d), 0),
-                    "duplicates": round(duplicates_30d / len(daily_30d), 0),
-                    "validity_pct": round(validity_30d, 2),
-                    "status": "N/A",
-                })
+                scorecard.append(
+                    QualityMetricsProvider._period_average("Last 30 Days Average", daily_30d)
+                )
             
             return scorecard
         except Exception as e:
             logger.error(f"Failed to generate quality scorecard: {e}")
             return []
     
+    @staticmethod
+    def _period_average(period: str, daily: List[DailyMetrics]) -> Dict[str, Any]:
+        """
+        Build a scorecard row of per-day averages over a period.
+
+        Args:
+            period: Scorecard period label
+            daily: Non-empty list of daily metrics in the period
+
+        Returns:
+            Scorecard row dictionary
+        """
+        # One vectorized reduction over all four counters
+        totals = np.array(
+            [[d.total_rows, d.valid_rows, d.invalid_rows, d.duplicates] for d in daily],
+            dtype=np.int64,
+        ).sum(axis=0)
+        total_rows, valid_rows, invalid_rows, duplicates = totals.tolist()
+        days = len(daily)
+        
+        validity = (valid_rows / total_rows * 100) if total_rows > 0 else 0
+        
+        return {
+            "period": period,
+            "run_time": None,
+            "total_rows": round(total_rows / days, 0),
+            "valid_rows": round(valid_rows / days, 0),
+            "invalid_rows": round(invalid_rows / days, 0),
+            "duplicates": round(duplicates / days, 0),
+            "validity_pct": round(validity, 2),
+            "status": "N/A",
+        }
+    
     @staticmethod
     def check_quality_degradation(threshold_pct: float = 90.0) -> Dict[str, Any]:
         """
@@ -11,7 +11,7 @@ Coordinates the complete ETL workflow:
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional, cast
 import sys
 import os
 
@@ -19,10 +19,11 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.connection import DatabaseConnection
-from config.settings import Settings
-from etl.extract import fetch_google_sheet
-from etl.transform import validate_and_transform
-from etl.load import load_students, load_invalid_rows
+from config.settings import Settings, get_settings
+from etl.extract import iter_google_sheet
+from etl.transform import iter_validate_and_transform
+from etl.load import load_students, InvalidRowLoader
+from etl.metrics import clear_metrics_cache
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +36,9 @@ class ETLOrchestrator:
     1. Initialize database connection
     2. Extract data from Google Sheets
     3. Transform and validate rows
-    4. Load valid rows into database
-    5. Load invalid rows into dead-letter queue
-    6. Record metrics in etl_runs table
+    4. Load valid rows into database and invalid rows into the
+       dead-letter queue, chunk by chunk
+    5. Record final metrics in etl_runs table
     """
 
     def __init__(self, settings: Settings):
@@ -51,6 +52,8 @@ class ETLOrchestrator:
         self.etl_run_id: int = None
         self.start_time: datetime = None
         self.end_time: datetime = None
+        self.duration_seconds: float = 0.0
+        self._started: float = 0.0
         self.metrics: Dict[str, Any] = {
             "total_rows": 0,
             "valid_rows": 0,
@@ -67,6 +70,7 @@ class ETLOrchestrator:
             True if successful, False otherwise
         """
         self.start_time = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
         
         try:
             logger.info("=" * 60)
@@ -76,8 +80,8 @@ class ETLOrchestrator:
             # Initialize database connection
             self._initialize_database()
 
-            # Initialize ETL run record
-            self._create_etl_run_record()
+            # Create the run record up front so chunks can reference it
+            self._record_etl_run("in_progress")
 
             # Extract, transform, load
             self._execute_pipeline()
@@ -94,116 +98,120 @@ class ETLOrchestrator:
 
         except Exception as e:
             logger.error(f"ETL Pipeline failed: {e}", exc_info=True)
-            self._finalize_etl_run("failed", str(e))
+            try:
+                self._finalize_etl_run("failed", str(e))
+            except Exception as record_error:
+                logger.error(f"Failed to record failed ETL run: {record_error}")
             return False
 
-        finally:
-            DatabaseConnection.close_all()
-
     def _initialize_database(self) -> None:
-        """Initialize database connection pool."""
+        """
+        Initialize database connection pool.
+
+        The pool is kept for the life of the process (closed at exit), so
+        repeated runs in one process reuse its connections.
+        """
         logger.info("Initializing database connection...")
         try:
             DatabaseConnection.initialize(
                 host=self.settings.DB_HOST,
                 port=self.settings.DB_PORT,
                 database=self.settings.DB_NAME,
-                user=self.settings.DB_USER,
-                password=self.settings.DB_PASSWORD,
-                min_connections=1,
-                max_connections=5,
+                # Settings validation guarantees both are set
+                user=cast(str, self.settings.DB_USER),
+                password=cast(str, self.settings.DB_PASSWORD),
+                min_connections=self.settings.DB_POOL_MIN,
+                max_connections=self.settings.DB_POOL_MAX,
+                recycle_seconds=self.settings.DB_POOL_RECYCLE,
             )
             logger.info("Database connection established")
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
             raise
 
-    def _create_etl_run_record(self) -> None:
-        """Create initial ETL run record."""
-        query = """
-            INSERT INTO etl_runs (total_rows, valid_rows, invalid_rows, inserted_rows, updated_rows, status)
-            VALUES (0, 0, 0, 0, 0, 'in_progress')
-            RETURNING id;
-        """
-        with DatabaseConnection.get_cursor() as cursor:
-            cursor.execute(query)
-            self.etl_run_id = cursor.fetchone()[0]
-        logger.info(f"Created ETL run record: {self.etl_run_id}")
-
     def _execute_pipeline(self) -> None:
         """
         Execute the main ETL pipeline.
         
-        Steps:
+        The sheet is streamed in chunks of CHUNK_ROWS rows; each chunk goes
+        through every step before the next is fetched, so only one chunk
+        is held in memory at a time.
+
+        Steps (per chunk):
         1. Extract data from Google Sheets
         2. Transform and validate records
         3. Load valid records into students table
-        4. Load invalid records to dead-letter queue
+        4. Load invalid records into the dead-letter queue
         """
         logger.info("Executing ETL pipeline steps...")
+        logger.info(f"Streaming sheet in chunks of {self.settings.CHUNK_ROWS} rows...")
 
-        # EXTRACT
-        logger.info("Step 1: Extracting data from Google Sheets...")
-        df = fetch_google_sheet(self.settings)
-        self.metrics["total_rows"] = len(df)
+        self.metrics["skipped_rows"] = 0
+        invalid_loader = InvalidRowLoader(bulk_unsafe=self.settings.BULK_UNSAFE)
+        chunks = iter_validate_and_transform(iter_google_sheet(self.settings))
 
-        # TRANSFORM & VALIDATE
-        logger.info("Step 2: Transforming and validating data...")
-        valid_records, invalid_records, transform_metrics = validate_and_transform(df)
-        
-        # Update metrics from transform
-        self.metrics["total_rows"] = transform_metrics["total_rows"]
-        self.metrics["valid_rows"] = transform_metrics["valid_rows"]
-        self.metrics["invalid_rows"] = transform_metrics["invalid_rows"]
-        self.metrics["duplicate_emails"] = transform_metrics.get("duplicate_emails", 0)
-
-        # LOAD VALID RECORDS
-        if valid_records:
-            logger.info("Step 3: Loading valid records into database...")
-            load_metrics = load_students(valid_records, batch_size=self.settings.BATCH_SIZE)
-            self.metrics["inserted_rows"] = load_metrics["inserted"]
-            self.metrics["skipped_rows"] = load_metrics["skipped"]
-        else:
-            logger.warning("No valid records to load")
-            self.metrics["inserted_rows"] = 0
-            self.metrics["skipped_rows"] = 0
+        for chunk_number, (valid_records, invalid_records, transform_metrics) in enumerate(chunks, 1):
+            logger.info(
+                f"Chunk {chunk_number}: {len(valid_records)} valid, {len(invalid_records)} invalid"
+            )
 
-        # LOAD INVALID RECORDS TO DEAD-LETTER QUEUE
-        if invalid_records:
-            logger.info(f"Step 4: Loading {len(invalid_records)} invalid records to dead-letter queue...")
-            load_invalid_rows(invalid_records, self.etl_run_id)
-        else:
+            # Update metrics from transform (cumulative across chunks)
+            self.metrics["total_rows"] = transform_metrics["total_rows"]
+            self.metrics["valid_rows"] = transform_metrics["valid_rows"]
+            self.metrics["invalid_rows"] = transform_metrics["invalid_rows"]
+            self.metrics["duplicate_emails"] = transform_metrics.get("duplicate_emails", 0)
+
+            # LOAD VALID RECORDS
+            if valid_records:
+                load_metrics = load_students(
+                    valid_records,
+                    batch_size=self.settings.BATCH_SIZE,
+                    bulk_unsafe=self.settings.BULK_UNSAFE,
+                )
+                self.metrics["inserted_rows"] += load_metrics["inserted"]
+                self.metrics["skipped_rows"] += load_metrics["skipped"]
+
+            # LOAD INVALID RECORDS INTO THE DEAD-LETTER QUEUE
+            if invalid_records:
+                invalid_loader.load_invalid_rows(invalid_records, self.etl_run_id)
+
+        if not self.metrics["valid_rows"]:
+            logger.warning("No valid records to load")
+        if not self.metrics["invalid_rows"]:
             logger.info("No invalid records to load")
 
         logger.info("Pipeline execution completed")
 
     def _finalize_etl_run(self, status: str, error_message: str = None) -> None:
         """
-        Update ETL run record with final metrics.
+        Record the ETL run with final metrics.
+
+        Updates the row created at the start of the run (or inserts one if
+        the run failed before it was created), in its own transaction.
 
         Args:
             status: Final status ('success', 'partial_success', 'failed')
             error_message: Error details if failed
         """
+        # Monotonic clock for the duration; wall-clock time only for the record
+        self.duration_seconds = time.perf_counter() - self._started
         self.end_time = datetime.now(timezone.utc)
-        duration = (self.end_time - self.start_time).total_seconds()
-
-        query = """
-            UPDATE etl_runs
-            SET status = %s,
-                total_rows = %s,
-                valid_rows = %s,
-                invalid_rows = %s,
-                duplicate_emails = %s,
-                inserted_rows = %s,
-                skipped_rows = %s,
-                updated_rows = %s,
-                duration_seconds = %s,
-                error_message = %s
-            WHERE id = %s;
+
+        self._record_etl_run(status, error_message)
+        clear_metrics_cache()
+        logger.info(f"ETL run {self.etl_run_id} finalized with status: {status}")
+
+    def _record_etl_run(self, status: str, error_message: Optional[str] = None) -> None:
         """
+        Insert the etl_runs row, or update it if it was already written.
+
+        Runs in its own transaction.
 
-        params = (
+        Args:
+            status: Run status ('in_progress' when created)
+            error_message: Error details if failed
+        """
+        metrics = (
             status,
             self.metrics["total_rows"],
             self.metrics["valid_rows"],
@@ -212,18 +220,36 @@ class ETLOrchestrator:
             self.metrics["inserted_rows"],
             self.metrics.get("skipped_rows", 0),
             self.metrics["updated_rows"],
-            duration,
+            self.duration_seconds,
             error_message,
-            self.etl_run_id,
         )
 
-        DatabaseConnection.execute_update(query, params)
-        logger.info(f"ETL run {self.etl_run_id} finalized with status: {status}")
+        if self.etl_run_id is None:
+            query = """
+                INSERT INTO etl_runs (
+                    run_timestamp, status, total_rows, valid_rows, invalid_rows,
+                    duplicate_emails, inserted_rows, skipped_rows, updated_rows,
+                    duration_seconds, error_message
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id;
+            """
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(query, (self.start_time,) + metrics)
+                self.etl_run_id = cursor.fetchone()[0]
+        else:
+            query = """
+                UPDATE etl_runs
+                SET status = %s, total_rows = %s, valid_rows = %s, invalid_rows = %s,
+                    duplicate_emails = %s, inserted_rows = %s, skipped_rows = %s,
+                    updated_rows = %s, duration_seconds = %s, error_message = %s
+                WHERE id = %s;
+            """
+            DatabaseConnection.execute_update(query, metrics + (self.etl_run_id,))
 
     def _log_summary(self) -> None:
         """Log ETL execution summary with all metrics."""
-        duration = (self.end_time - self.start_time).total_seconds()
-        logger.info(f"Duration: {duration:.2f} seconds")
+        logger.info(f"Duration: {self.duration_seconds:.2f} seconds")
         logger.info(f"Total rows processed: {self.metrics['total_rows']}")
         logger.info(f"Valid rows: {self.metrics['valid_rows']}")
         logger.info(f"Invalid rows: {self.metrics['invalid_rows']}")
@@ -278,7 +304,7 @@ def main() -> None:
     setup_logging()
     
     try:
-        settings = Settings()
+        settings = get_settings()
         orchestrator = ETLOrchestrator(settings)
         success = orchestrator.run()
         sys.exit(0 if success else 1)
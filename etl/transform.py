@@ -6,14 +6,62 @@ Handles deduplication and type conversions.
 """
 
 import logging
+import numpy as np
 import pandas as pd
-from typing import Tuple, List, Dict, Any
-import json
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Tuple, List, Dict, Any, Iterable, Iterator
 
 from etl.validator import StudentRecordValidator
 
 logger = logging.getLogger(__name__)
 
+# Validators are stateless; build them once per process
+_VALIDATOR = StudentRecordValidator()
+
+
+def _clean_text(column: pd.Series, lower: bool = False) -> pd.Series:
+    """
+    Strip (and optionally lowercase) a column; blank cells become NA.
+
+    Calls the Arrow compute kernels directly on the column's Arrow array,
+    skipping per-element Python calls and pandas' .str dispatch.
+
+    Args:
+        column: Raw column values
+        lower: Whether to lowercase the stripped values
+
+    Returns:
+        Arrow-backed string Series
+    """
+    text = pc.utf8_trim_whitespace(pa.array(column.astype("string[pyarrow]")))
+    if lower:
+        text = pc.utf8_lower(text)
+    text = pc.if_else(pc.equal(text, ""), pa.scalar(None, text.type), text)
+    return pd.Series(pd.arrays.ArrowExtensionArray(text), index=column.index)
+
+
+def _clean_year(column: pd.Series) -> pd.Series:
+    """
+    Convert a year column to integers, truncating fractional values.
+
+    Values that are not finite numbers are passed through unchanged so the
+    validator can reject them with the original value in the message.
+
+    Args:
+        column: Raw column values
+
+    Returns:
+        Object Series of int, original value, or None for blank cells
+    """
+    text = _clean_text(column)
+    numbers = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    parsed = np.isfinite(numbers)
+
+    years = column.astype(object).where(text.notna(), None)
+    years[parsed] = np.trunc(numbers[parsed]).astype(np.int64).astype(object)
+    return years
+
 
 class DataTransformer:
     """
@@ -26,17 +74,22 @@ class DataTransformer:
     - Field validation
     - Error isolation
     - Quality metrics computation
+
+    A transformer can be fed a sheet in several chunks: deduplication,
+    row numbering and metrics then carry across all chunks it has seen.
     """
 
     def __init__(self):
         """Initialize transformer with validators."""
-        self.validator = StudentRecordValidator()
+        self.validator = _VALIDATOR
         self.metrics = {
             "total_rows": 0,
             "duplicate_emails": 0,
             "valid_rows": 0,
             "invalid_rows": 0,
         }
+        self._seen_emails: set = set()
+        self._records_seen = 0
 
     def transform(
         self, df: pd.DataFrame
@@ -50,11 +103,12 @@ class DataTransformer:
         Returns:
             Tuple of (valid_records, invalid_records, metrics)
             metrics dict includes: total_rows, duplicate_emails, valid_rows, invalid_rows
+            (cumulative over every frame passed to this transformer)
 
         Raises:
             ValueError: If DataFrame is empty or missing required columns
         """
-        self.metrics["total_rows"] = len(df)
+        self.metrics["total_rows"] += len(df)
         
         if df.empty:
             logger.warning("Input DataFrame is empty")
@@ -65,17 +119,22 @@ class DataTransformer:
         # Normalize column names
         df = self._normalize_columns(df)
 
-        # Clean and normalize data
-        records = self._dataframe_to_records(df)
+        # Clean and normalize data column-wise
+        df = self._clean_columns(df)
 
         # Deduplicate by email and track duplicates
-        records, duplicates_removed = self._deduplicate(records)
-        self.metrics["duplicate_emails"] = duplicates_removed
+        df, duplicates_removed = self._deduplicate(df)
+        self.metrics["duplicate_emails"] += duplicates_removed
 
-        # Validate records
-        valid_records, invalid_records = self.validator.validate_batch(records)
-        self.metrics["valid_rows"] = len(valid_records)
-        self.metrics["invalid_rows"] = len(invalid_records)
+        records = self._dataframe_to_records(df)
+
+        # Validate records, numbering rows across chunks
+        valid_records, invalid_records = self.validator.validate_batch(
+            records, start=self._records_seen + 1
+        )
+        self._records_seen += len(records)
+        self.metrics["valid_rows"] += len(valid_records)
+        self.metrics["invalid_rows"] += len(invalid_records)
 
         logger.info(
             f"Transformation complete: {len(valid_records)} valid, {len(invalid_records)} invalid, "
@@ -97,77 +156,83 @@ class DataTransformer:
         df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
         return df
 
-    def _dataframe_to_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _clean_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Convert DataFrame to list of dictionaries with data cleaning.
+        Clean student columns with vectorized string operations.
+
+        Emails are trimmed and lowercased, other text fields trimmed, and
+        year converted to int. Blank cells become missing. Columns absent
+        from the sheet are left out, except year which is always present.
 
         Args:
             df: Normalized DataFrame
 
         Returns:
-            List of cleaned record dictionaries
+            DataFrame with cleaned email, name, year, phone, department columns
         """
-        records = []
+        columns = {}
 
-        for idx, row in df.iterrows():
-            record = {}
+        if "email" in df.columns:
+            columns["email"] = _clean_text(df["email"], lower=True)
+        if "name" in df.columns:
+            columns["name"] = _clean_text(df["name"])
 
-            # Email (required, normalize)
-            if "email" in row.index:
-                record["email"] = str(row["email"]).strip().lower() if row["email"] else None
+        columns["year"] = (
+            _clean_year(df["year"]) if "year" in df.columns
+            else pd.Series(None, index=df.index, dtype=object)
+        )
 
-            # Name (required, strip whitespace)
-            if "name" in row.index:
-                record["name"] = str(row["name"]).strip() if row["name"] else None
+        for column in ("phone", "department"):
+            if column in df.columns:
+                columns[column] = _clean_text(df[column])
 
-            # Year (optional, convert to int)
-            if "year" in row.index and row["year"]:
-                try:
-                    record["year"] = int(float(str(row["year"]).strip()))
-                except (ValueError, TypeError):
-                    record["year"] = row["year"]  # Let validator catch the error
-            else:
-                record["year"] = None
+        return pd.DataFrame(columns, index=df.index)
 
-            # Phone (optional, strip whitespace)
-            if "phone" in row.index:
-                record["phone"] = str(row["phone"]).strip() if row["phone"] else None
+    def _dataframe_to_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Convert a cleaned DataFrame to a list of record dictionaries.
 
-            # Department (optional, strip whitespace)
-            if "department" in row.index:
-                record["department"] = str(row["department"]).strip() if row["department"] else None
+        Args:
+            df: Cleaned DataFrame
 
-            records.append(record)
+        Returns:
+            List of record dictionaries, with None for missing values
+        """
+        records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
 
         logger.debug(f"Converted {len(records)} rows to record dictionaries")
 
         return records
 
-    def _deduplicate(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    def _deduplicate(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
         """
         Remove duplicate records by email (keep first occurrence).
 
+        Rows without an email are dropped as well and counted as removed.
+        Emails already seen in earlier frames also count as duplicates.
+
         Args:
-            records: List of records
+            df: Cleaned DataFrame
 
         Returns:
-            Tuple of (deduplicated_list, duplicates_removed_count)
+            Tuple of (deduplicated_frame, duplicates_removed_count)
         """
-        seen_emails = set()
-        deduplicated = []
+        before = len(df)
 
-        for record in records:
-            email = record.get("email")
-            if email and email not in seen_emails:
-                seen_emails.add(email)
-                deduplicated.append(record)
+        if "email" in df.columns:
+            df = df.dropna(subset=["email"]).drop_duplicates(subset="email", keep="first")
+            if self._seen_emails:
+                df = df[~df["email"].isin(self._seen_emails)]
+            self._seen_emails.update(df["email"])
+        else:
+            df = df.iloc[0:0]
 
-        duplicates_removed = len(records) - len(deduplicated)
+        duplicates_removed = before - len(df)
         
         if duplicates_removed > 0:
             logger.warning(f"Removed {duplicates_removed} duplicate records by email")
 
-        return deduplicated, duplicates_removed
+        return df, duplicates_removed
 
 
 def validate_and_transform(
@@ -184,3 +249,24 @@ def validate_and_transform(
     """
     transformer = DataTransformer()
     return transformer.transform(df)
+
+
+def iter_validate_and_transform(
+    chunks: Iterable[pd.DataFrame],
+) -> Iterator[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]]:
+    """
+    Transform a sheet streamed in chunks.
+
+    Duplicate emails are detected across chunks, and invalid row numbers
+    match those of a single validate_and_transform() call on the whole sheet.
+
+    Args:
+        chunks: Raw DataFrames from extraction, in sheet order
+
+    Yields:
+        Tuple of (valid_records, invalid_records, metrics) per chunk;
+        metrics are cumulative over the chunks seen so far
+    """
+    transformer = DataTransformer()
+    for df in chunks:
+        yield transformer.transform(df)
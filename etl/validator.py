@@ -7,11 +7,59 @@ Provides reusable validators for data quality checks.
 
 import re
 import logging
-from typing import Any, Tuple, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Tuple, Optional
 from abc import ABC, abstractmethod
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
 logger = logging.getLogger(__name__)
 
+# Fixed error messages (messages that embed the offending value are
+# formatted where they are raised)
+ERR_EMAIL_REQUIRED = "Email is required and must be a string"
+ERR_EMAIL_TOO_LONG = "Email exceeds maximum length of 255 characters"
+ERR_NAME_REQUIRED = "Name is required and must be a string"
+ERR_NAME_TOO_SHORT = "Name must be at least 2 characters"
+ERR_NAME_TOO_LONG = "Name exceeds maximum length of 255 characters"
+ERR_PHONE_NOT_STRING = "Phone must be a string"
+ERR_PHONE_TOO_FEW_DIGITS = "Phone number must contain at least 10 digits"
+ERR_PHONE_TOO_LONG = "Phone number exceeds maximum length of 20 characters"
+ERR_DEPARTMENT_NOT_STRING = "Department must be a string"
+ERR_DEPARTMENT_TOO_SHORT = "Department name must be at least 2 characters"
+ERR_DEPARTMENT_TOO_LONG = "Department name exceeds maximum length of 255 characters"
+ERR_EMAIL_MISSING = "Required field missing: email"
+ERR_NAME_MISSING = "Required field missing: name"
+
+# Compiled once at import instead of going through re's pattern cache per
+# call. Patterns are unanchored; use fullmatch() (or anchor them explicitly).
+# Stdlib re is deliberate: validate_email rejects input over 255 characters
+# before matching, which bounds EMAIL_REGEX backtracking to a few
+# microseconds, and RE2's Python binding costs more per call than that.
+EMAIL_REGEX = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+NAME_REGEX = re.compile(r"[a-zA-Z\s\-']+")
+
+# Name characters: exactly the set NAME_REGEX accepts (its \s is every
+# character for which str.isspace() is true)
+_NAME_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-'"
+    " \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2000\u2001\u2002\u2003"
+    "\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
+# Phone characters: ASCII digits, plus separators (spaces, hyphens, plus,
+# parentheses). Other Unicode digits and whitespace are handled separately.
+_PHONE_DIGITS = frozenset("0123456789")
+_PHONE_SEPARATORS = frozenset(" -+()")
+
+# Distinguishes an absent optional field from one explicitly set to None
+_MISSING = object()
+
+# Batches at least this large are pre-screened with vectorized column checks
+SCREEN_MIN_ROWS = 1000
+
 
 class Validator(ABC):
     """Abstract base class for field validators."""
@@ -27,163 +75,292 @@ class Validator(ABC):
         pass
 
 
-class EmailValidator(Validator):
-    """Validates email addresses."""
+def validate_email(value: Any) -> Tuple[bool, Optional[str]]:
+    """
+    Validate email format.
 
-    EMAIL_REGEX = re.compile(
-        r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    )
+    Args:
+        value: Email address to validate
 
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
-        """
-        Validate email format.
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not value or not isinstance(value, str):
+        return False, ERR_EMAIL_REQUIRED
 
-        Args:
-            value: Email address to validate
+    # Normalized unconditionally: strip() returns the same object when
+    # there is nothing to strip, and lower() on ASCII text is cheaper
+    # than an islower() pre-check
+    value = value.strip().lower()
 
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
-        if not value or not isinstance(value, str):
-            return False, "Email is required and must be a string"
+    # Length first, so oversized input never reaches the regex
+    if len(value) > 255:
+        return False, ERR_EMAIL_TOO_LONG
 
-        value = value.strip().lower()
+    # A substring scan for '@' rejects most malformed values without
+    # starting the regex engine
+    if "@" not in value or not EMAIL_REGEX.fullmatch(value):
+        return False, f"Invalid email format: {value}"
 
-        if not self.EMAIL_REGEX.match(value):
-            return False, f"Invalid email format: {value}"
+    return True, None
 
-        if len(value) > 255:
-            return False, "Email exceeds maximum length of 255 characters"
 
-        return True, None
+def validate_name(value: Any) -> Tuple[bool, Optional[str]]:
+    """
+    Validate student name.
 
+    Args:
+        value: Name to validate
 
-class NameValidator(Validator):
-    """Validates student names."""
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not value or not isinstance(value, str):
+        return False, ERR_NAME_REQUIRED
 
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
-        """
-        Validate student name.
+    value = value.strip()
 
-        Args:
-            value: Name to validate
+    if len(value) < 2:
+        return False, ERR_NAME_TOO_SHORT
 
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
-        if not value or not isinstance(value, str):
-            return False, "Name is required and must be a string"
+    if len(value) > 255:
+        return False, ERR_NAME_TOO_LONG
+
+    # Allow letters, spaces, hyphens, apostrophes (a set check is cheaper
+    # than NAME_REGEX for names of typical length)
+    if not _NAME_CHARS.issuperset(value):
+        return False, f"Name contains invalid characters: {value}"
 
-        value = value.strip()
+    return True, None
 
-        if len(value) < 2:
-            return False, "Name must be at least 2 characters"
 
-        if len(value) > 255:
-            return False, "Name exceeds maximum length of 255 characters"
+def validate_year(value: Any) -> Tuple[bool, Optional[str]]:
+    """
+    Validate year of study.
 
-        # Allow letters, spaces, hyphens, apostrophes
-        if not re.match(r"^[a-zA-Z\s\-']+$", value):
-            return False, f"Name contains invalid characters: {value}"
+    Args:
+        value: Year value to validate
 
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if value is None or value == "":
+        # Year is optional
         return True, None
 
+    # Ints and strings skip the str() round trip; bools and other types
+    # keep going through it (str(True) is not a valid integer)
+    if type(value) is int:
+        year = value
+    else:
+        try:
+            year = int(value.strip() if type(value) is str else str(value).strip())
+        except (ValueError, TypeError):
+            return False, f"Year must be a valid integer, got: {value}"
 
-class YearValidator(Validator):
-    """Validates student year (1-4)."""
+    if year < 1 or year > 4:
+        return False, f"Year must be between 1 and 4, got: {year}"
 
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
-        """
-        Validate year of study.
+    return True, None
 
-        Args:
-            value: Year value to validate
 
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
-        if value is None or value == "":
-            # Year is optional
-            return True, None
+def validate_phone(value: Any) -> Tuple[bool, Optional[str]]:
+    """
+    Validate phone number format.
 
-        # Try to convert to integer
-        try:
-            year = int(str(value).strip())
-        except (ValueError, TypeError):
-            return False, f"Year must be a valid integer, got: {value}"
+    Args:
+        value: Phone number to validate
 
-        if year < 1 or year > 4:
-            return False, f"Year must be between 1 and 4, got: {year}"
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if value is None or value == "":
+        # Phone is optional
+        return True, None
 
+    if not isinstance(value, str):
+        return False, ERR_PHONE_NOT_STRING
+
+    value = value.strip()
+
+    if not value:
+        return False, f"Phone contains invalid characters: {value}"
+
+    # Allow digits, spaces, hyphens, plus, parentheses; count digits in
+    # the same pass
+    digits = 0
+    for char in value:
+        if char in _PHONE_DIGITS:
+            digits += 1
+        elif char in _PHONE_SEPARATORS:
+            continue
+        elif char.isdecimal():
+            digits += 1
+        elif not char.isspace():
+            return False, f"Phone contains invalid characters: {value}"
+
+    if digits < 10:
+        return False, ERR_PHONE_TOO_FEW_DIGITS
+
+    if len(value) > 20:
+        return False, ERR_PHONE_TOO_LONG
+
+    return True, None
+
+
+def validate_department(value: Any) -> Tuple[bool, Optional[str]]:
+    """
+    Validate department name.
+
+    Args:
+        value: Department name to validate
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if value is None or value == "":
+        # Department is optional
         return True, None
 
+    if not isinstance(value, str):
+        return False, ERR_DEPARTMENT_NOT_STRING
 
-class PhoneValidator(Validator):
-    """Validates phone numbers."""
+    value = value.strip()
+
+    if len(value) < 2:
+        return False, ERR_DEPARTMENT_TOO_SHORT
+
+    if len(value) > 255:
+        return False, ERR_DEPARTMENT_TOO_LONG
+
+    return True, None
+
+
+class EmailValidator(Validator):
+    """Validates email addresses."""
+
+    EMAIL_REGEX = EMAIL_REGEX
 
     def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
-        """
-        Validate phone number format.
+        """Validate a value with validate_email."""
+        return validate_email(value)
 
-        Args:
-            value: Phone number to validate
 
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
-        if value is None or value == "":
-            # Phone is optional
-            return True, None
+class NameValidator(Validator):
+    """Validates student names."""
 
-        if not isinstance(value, str):
-            return False, "Phone must be a string"
+    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+        """Validate a value with validate_name."""
+        return validate_name(value)
 
-        value = value.strip()
 
-        # Allow digits, spaces, hyphens, plus, parentheses
-        if not re.match(r"^[\d\s\-+()]+$", value):
-            return False, f"Phone contains invalid characters: {value}"
+class YearValidator(Validator):
+    """Validates student year (1-4)."""
 
-        # Remove non-digit characters and check minimum length
-        digits_only = re.sub(r"\D", "", value)
-        if len(digits_only) < 10:
-            return False, "Phone number must contain at least 10 digits"
+    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+        """Validate a value with validate_year."""
+        return validate_year(value)
 
-        if len(value) > 20:
-            return False, "Phone number exceeds maximum length of 20 characters"
 
-        return True, None
+class PhoneValidator(Validator):
+    """Validates phone numbers."""
+
+    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+        """Validate a value with validate_phone."""
+        return validate_phone(value)
 
 
 class DepartmentValidator(Validator):
     """Validates department names."""
 
     def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
-        """
-        Validate department name.
+        """Validate a value with validate_department."""
+        return validate_department(value)
 
-        Args:
-            value: Department name to validate
 
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
-        if value is None or value == "":
-            # Department is optional
-            return True, None
+def _text_column(records: list, field: str) -> Tuple[pa.Array, np.ndarray]:
+    """
+    Collect one field of a batch for vectorized screening.
+
+    Args:
+        records: List of dictionaries with student data
+        field: Field name
 
-        if not isinstance(value, str):
-            return False, "Department must be a string"
+    Returns:
+        Tuple of (stripped ASCII strings, missing mask). Values that are not
+        ASCII strings become null, so the screen leaves them undecided.
+    """
+    values = [record.get(field) for record in records]
+    missing = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    text = pa.array([value if type(value) is str else None for value in values], type=pa.string())
+    text = pc.if_else(pc.string_is_ascii(text), text, pa.scalar(None, pa.string()))
+    return pc.utf8_trim_whitespace(text), missing
 
-        value = value.strip()
 
-        if len(value) < 2:
-            return False, "Department name must be at least 2 characters"
+def _length_between(text: pa.Array, low: int, high: int) -> pa.Array:
+    """Arrow mask of strings whose length is within [low, high]."""
+    length = pc.utf8_length(text)
+    return pc.and_(pc.greater_equal(length, low), pc.less_equal(length, high))
 
-        if len(value) > 255:
-            return False, "Department name exceeds maximum length of 255 characters"
 
-        return True, None
+def screen_records(records: list) -> np.ndarray:
+    """
+    Vectorized pre-screen that flags records which are certainly valid.
+
+    Applies each field rule to whole columns with Arrow compute kernels.
+    The checks are conservative: a flagged record always passes
+    StudentRecordValidator.validate_record, while unflagged records (wrong
+    types, non-ASCII text, or anything the kernels cannot decide) still
+    need the per-record validators, which also produce the error messages.
+
+    Args:
+        records: List of dictionaries with student data
+
+    Returns:
+        Boolean array, True where the record is known to be valid
+    """
+    email, _ = _text_column(records, "email")
+    email = pc.utf8_lower(email)
+    passed = pc.and_(
+        pc.match_substring_regex(email, f"^{EMAIL_REGEX.pattern}$"),
+        pc.less_equal(pc.utf8_length(email), 255),
+    )
+
+    name, _ = _text_column(records, "name")
+    passed = pc.and_(passed, _length_between(name, 2, 255))
+    passed = pc.and_(passed, pc.match_substring_regex(name, f"^{NAME_REGEX.pattern}$"))
+
+    phone, phone_missing = _text_column(records, "phone")
+    phone_ok = pc.and_(
+        pc.match_substring_regex(phone, r"^[\d\s\-+()]+$"),
+        pc.and_(
+            pc.greater_equal(pc.count_substring_regex(phone, r"\d"), 10),
+            pc.less_equal(pc.utf8_length(phone), 20),
+        ),
+    )
+
+    department, department_missing = _text_column(records, "department")
+    department_ok = _length_between(department, 2, 255)
+
+    # Only real ints (not bools, floats or strings) are decided here
+    year_ok = np.fromiter(
+        (
+            year is None or (type(year) is int and 1 <= year <= 4)
+            for year in (record.get("year") for record in records)
+        ),
+        dtype=bool,
+        count=len(records),
+    )
+
+    def mask(values: pa.Array) -> np.ndarray:
+        return pc.fill_null(values, False).to_numpy(zero_copy_only=False)
+
+    return (
+        mask(passed)
+        & (phone_missing | mask(phone_ok))
+        & (department_missing | mask(department_ok))
+        & year_ok
+    )
 
 
 class StudentRecordValidator:
@@ -191,9 +368,9 @@ class StudentRecordValidator:
     Validates complete student records using field validators.
     """
 
-    def __init__(self):
-        """Initialize validators for each field."""
-        self.validators = {
+    def __init__(self) -> None:
+        """Initialize validators for each field (for single-field checks)."""
+        self.validators: Dict[str, Validator] = {
             "email": EmailValidator(),
             "name": NameValidator(),
             "year": YearValidator(),
@@ -212,45 +389,116 @@ class StudentRecordValidator:
             Tuple of (is_valid, error_message)
         """
         # Check required fields
-        required_fields = ["email", "name"]
-        for field in required_fields:
-            if field not in record or not record.get(field):
-                return False, f"Required field missing: {field}"
-
-        # Validate each field
-        for field, validator in self.validators.items():
-            if field in record:
-                is_valid, error = validator.validate(record[field])
-                if not is_valid:
-                    return False, f"{field}: {error}"
+        email = record.get("email")
+        if not email:
+            return False, ERR_EMAIL_MISSING
+
+        name = record.get("name")
+        if not name:
+            return False, ERR_NAME_MISSING
+
+        # Validate each field, in the order errors are reported
+        is_valid, error = validate_email(email)
+        if not is_valid:
+            return False, f"email: {error}"
+
+        is_valid, error = validate_name(name)
+        if not is_valid:
+            return False, f"name: {error}"
+
+        year = record.get("year", _MISSING)
+        if year is not _MISSING:
+            is_valid, error = validate_year(year)
+            if not is_valid:
+                return False, f"year: {error}"
+
+        phone = record.get("phone", _MISSING)
+        if phone is not _MISSING:
+            is_valid, error = validate_phone(phone)
+            if not is_valid:
+                return False, f"phone: {error}"
+
+        department = record.get("department", _MISSING)
+        if department is not _MISSING:
+            is_valid, error = validate_department(department)
+            if not is_valid:
+                return False, f"department: {error}"
 
         return True, None
 
-    def validate_batch(self, records: list) -> Tuple[list, list]:
+    def validate_batch(self, records: list, start: int = 1) -> Tuple[list, list]:
         """
         Validate a batch of records.
 
+        Batches of SCREEN_MIN_ROWS or more are pre-screened column-wise
+        (see screen_records); only records the screen cannot clear go
+        through the per-record validators.
+
         Args:
             records: List of dictionaries with student data
+            start: Row number of the first record (default: 1)
 
         Returns:
             Tuple of (valid_records, invalid_records_with_reasons)
         """
-        valid_records = []
-        invalid_records = []
-
-        for idx, record in enumerate(records, 1):
-            is_valid, error = self.validate_record(record)
-
-            if is_valid:
-                valid_records.append(record)
-            else:
-                invalid_records.append({
-                    "row_number": idx,
-                    "record": record,
-                    "error_reason": error,
-                })
+        if len(records) >= SCREEN_MIN_ROWS:
+            screened = screen_records(records).tolist()
+        else:
+            screened = [False] * len(records)
+
+        validate_record = self.validate_record
+        results = [
+            (True, None) if known_valid else validate_record(record)
+            for record, known_valid in zip(records, screened)
+        ]
+
+        valid_records = [
+            record for record, (is_valid, _) in zip(records, results) if is_valid
+        ]
+        invalid_records = [
+            {"row_number": idx, "record": record, "error_reason": error}
+            for idx, (record, (is_valid, error)) in enumerate(zip(records, results), start)
+            if not is_valid
+        ]
 
         logger.info(f"Validation complete: {len(valid_records)} valid, {len(invalid_records)} invalid")
 
         return valid_records, invalid_records
+
+    def validate_stream(
+        self, records: Iterable[dict], start: int = 1
+    ) -> Iterator[Tuple[bool, dict, Optional[str], int]]:
+        """
+        Validate records lazily, one result per record.
+
+        Unlike validate_batch, nothing is accumulated: records are read in
+        windows of SCREEN_MIN_ROWS (each pre-screened like a batch), so
+        memory stays constant for arbitrarily long inputs.
+
+        Args:
+            records: Iterable of dictionaries with student data
+            start: Row number of the first record (default: 1)
+
+        Yields:
+            Tuples of (is_valid, record, error_message, row_number)
+        """
+        records = iter(records)
+        idx = start
+
+        while True:
+            window = list(islice(records, SCREEN_MIN_ROWS))
+            if not window:
+                return
+
+            if len(window) == SCREEN_MIN_ROWS:
+                screened = screen_records(window).tolist()
+            else:
+                screened = [False] * len(window)
+
+            for record, known_valid in zip(window, screened):
+                if known_valid:
+                    yield True, record, None, idx
+                else:
+                    is_valid, error = self.validate_record(record)
+                    yield is_valid, record, error, idx
+                idx += 1